@@ -961,6 +961,14 @@ CACHE_DIR = DATA_DIR / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+####################################
+# Branding DIR
+####################################
+
+BRANDING_DIR = DATA_DIR / "branding"
+BRANDING_DIR.mkdir(parents=True, exist_ok=True)
+
+
 ####################################
 # DIRECT CONNECTIONS
 ####################################
@@ -751,6 +751,40 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+OAUTH_DISCOVERY_CACHE_TTL = os.environ.get("OAUTH_DISCOVERY_CACHE_TTL", "600")
+
+if OAUTH_DISCOVERY_CACHE_TTL == "":
+    OAUTH_DISCOVERY_CACHE_TTL = 0
+else:
+    try:
+        OAUTH_DISCOVERY_CACHE_TTL = int(OAUTH_DISCOVERY_CACHE_TTL)
+    except Exception:
+        OAUTH_DISCOVERY_CACHE_TTL = 600
+
+# Upper bound in bytes on a Shepherd server's tool list response (empty disables)
+SHEPHERD_TOOL_SPECS_MAX_SIZE = os.environ.get(
+    "SHEPHERD_TOOL_SPECS_MAX_SIZE", str(10 * 1024 * 1024)
+)
+
+if SHEPHERD_TOOL_SPECS_MAX_SIZE == "":
+    SHEPHERD_TOOL_SPECS_MAX_SIZE = None
+else:
+    try:
+        SHEPHERD_TOOL_SPECS_MAX_SIZE = int(SHEPHERD_TOOL_SPECS_MAX_SIZE)
+    except Exception:
+        SHEPHERD_TOOL_SPECS_MAX_SIZE = 10 * 1024 * 1024
+
+# Seconds a Shepherd server's tool list is reused before refetching (empty disables)
+SHEPHERD_TOOL_SPECS_CACHE_TTL = os.environ.get("SHEPHERD_TOOL_SPECS_CACHE_TTL", "30")
+
+if SHEPHERD_TOOL_SPECS_CACHE_TTL == "":
+    SHEPHERD_TOOL_SPECS_CACHE_TTL = 0
+else:
+    try:
+        SHEPHERD_TOOL_SPECS_CACHE_TTL = int(SHEPHERD_TOOL_SPECS_CACHE_TTL)
+    except Exception:
+        SHEPHERD_TOOL_SPECS_CACHE_TTL = 30
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -493,6 +493,7 @@ from open_webui.env import (
     ENABLE_OTEL,
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
+    AIOHTTP_CLIENT_TIMEOUT,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
     ENABLE_PUBLIC_ACTIVE_USERS_COUNT,
     # Admin Account Runtime Creation
@@ -633,6 +634,13 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    # Shared HTTP session so short-lived admin probes (e.g. tool server
+    # verification) reuse pooled keep-alive connections
+    app.state.http_session = aiohttp.ClientSession(
+        trust_env=True,
+        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+    )
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -659,6 +667,9 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if app.state.http_session is not None:
+        await app.state.http_session.close()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -684,6 +695,8 @@ app.state.config = AppConfig(
     redis_key_prefix=REDIS_KEY_PREFIX,
 )
 app.state.redis = None
+app.state.http_session = None
+app.state.branding_logo_path = None
 
 app.state.WEBUI_NAME = WEBUI_NAME
 app.state.LICENSE_METADATA = None
@@ -1794,6 +1807,9 @@ async def chat_completion(
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
                         await client.disconnect()
+                if shepherd_clients := metadata.get("shepherd_clients"):
+                    for client in shepherd_clients.values():
+                        await client.disconnect()
             except Exception as e:
                 log.debug(f"Error cleaning up: {e}")
                 pass
@@ -1,21 +1,24 @@
+import asyncio
+import hashlib
 import logging
-import copy
 import os
-import shutil
-from pathlib import Path
+import re
+import tempfile
+import time
+import aiofiles
+import orjson
 from fastapi import APIRouter, Depends, Request, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, ConfigDict
-import aiohttp
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
+from pathlib import Path
 from typing import Optional
 
-from open_webui.env import DATA_DIR
-
-from open_webui.env import AIOHTTP_CLIENT_TIMEOUT
+from open_webui.env import DATA_DIR, OAUTH_DISCOVERY_CACHE_TTL
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.config import get_config, save_config
-from open_webui.config import BannerModel
+from open_webui.config import BannerModel, BRANDING_DIR
 
 from open_webui.utils.tools import (
     get_tool_server_data,
@@ -24,7 +27,6 @@ from open_webui.utils.tools import (
 )
 from open_webui.utils.mcp.client import MCPClient
 from open_webui.utils.shepherd.client import ShepherdClient
-from open_webui.models.oauth_sessions import OAuthSessions
 
 
 from open_webui.utils.oauth import (
@@ -40,6 +42,48 @@ router = APIRouter()
 
 log = logging.getLogger(__name__)
 
+# OAuth 2.1 discovery documents keyed by tool server URL: (expires_at, metadata)
+OAUTH_SERVER_METADATA_CACHE: dict[str, tuple[float, dict]] = {}
+OAUTH_SERVER_METADATA_CACHE_MAX_ENTRIES = 256
+
+
+def update_config(config, key: str, value) -> bool:
+    """
+    Set a config value, skipping the persist (DB and Redis write) when the
+    value is unchanged. Returns True if the value was written.
+    """
+    if getattr(config, key) == value:
+        return False
+
+    setattr(config, key, value)
+    return True
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    return if_none_match.strip() == "*" or etag in [
+        tag.strip() for tag in if_none_match.split(",")
+    ]
+
+
+def etag_json_response(request: Request, body: bytes) -> Response:
+    """
+    Return a JSON body with a content-hash ETag, or 304 if the client already
+    has it.
+    """
+    etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
+
 
 ############################
 # ImportConfig
@@ -61,9 +105,9 @@ async def import_config(form_data: ImportConfigForm, user=Depends(get_admin_user
 ############################
 
 
-@router.get("/export", response_model=dict)
+@router.get("/export", response_class=ORJSONResponse)
 async def export_config(user=Depends(get_admin_user)):
-    return get_config()
+    return ORJSONResponse(get_config())
 
 
 ############################
@@ -76,12 +120,14 @@ class ConnectionsConfigForm(BaseModel):
     ENABLE_BASE_MODELS_CACHE: bool
 
 
-@router.get("/connections", response_model=ConnectionsConfigForm)
+CONNECTIONS_CONFIG_KEYS = tuple(ConnectionsConfigForm.model_fields)
+
+
+# Admin-only reads of our own config skip response model re-validation
+@router.get("/connections", response_model=None)
 async def get_connections_config(request: Request, user=Depends(get_admin_user)):
-    return {
-        "ENABLE_DIRECT_CONNECTIONS": request.app.state.config.ENABLE_DIRECT_CONNECTIONS,
-        "ENABLE_BASE_MODELS_CACHE": request.app.state.config.ENABLE_BASE_MODELS_CACHE,
-    }
+    config = request.app.state.config
+    return {key: getattr(config, key) for key in CONNECTIONS_CONFIG_KEYS}
 
 
 @router.post("/connections", response_model=ConnectionsConfigForm)
@@ -90,17 +136,12 @@ async def set_connections_config(
     form_data: ConnectionsConfigForm,
     user=Depends(get_admin_user),
 ):
-    request.app.state.config.ENABLE_DIRECT_CONNECTIONS = (
-        form_data.ENABLE_DIRECT_CONNECTIONS
-    )
-    request.app.state.config.ENABLE_BASE_MODELS_CACHE = (
-        form_data.ENABLE_BASE_MODELS_CACHE
-    )
+    config = request.app.state.config
+    data = form_data.model_dump()
+    for key in CONNECTIONS_CONFIG_KEYS:
+        update_config(config, key, data[key])
 
-    return {
-        "ENABLE_DIRECT_CONNECTIONS": request.app.state.config.ENABLE_DIRECT_CONNECTIONS,
-        "ENABLE_BASE_MODELS_CACHE": request.app.state.config.ENABLE_BASE_MODELS_CACHE,
-    }
+    return data
 
 
 class OAuthClientRegistrationForm(BaseModel):
@@ -161,11 +202,13 @@ class ToolServersConfigForm(BaseModel):
     TOOL_SERVER_CONNECTIONS: list[ToolServerConnection]
 
 
-@router.get("/tool_servers", response_model=ToolServersConfigForm)
+@router.get("/tool_servers", response_class=ORJSONResponse)
 async def get_tool_servers_config(request: Request, user=Depends(get_admin_user)):
-    return {
-        "TOOL_SERVER_CONNECTIONS": request.app.state.config.TOOL_SERVER_CONNECTIONS,
-    }
+    return ORJSONResponse(
+        {
+            "TOOL_SERVER_CONNECTIONS": request.app.state.config.TOOL_SERVER_CONNECTIONS,
+        }
+    )
 
 
 @router.post("/tool_servers", response_model=ToolServersConfigForm)
@@ -174,53 +217,136 @@ async def set_tool_servers_config(
     form_data: ToolServersConfigForm,
     user=Depends(get_admin_user),
 ):
+    oauth_client_manager = request.app.state.oauth_client_manager
+
+    # OAuth clients registered for the current connections: client key -> encrypted client info
+    old_oauth_clients = {}
+    for connection in request.app.state.config.TOOL_SERVER_CONNECTIONS:
+        if connection.get("auth_type", "none") == "oauth_2.1":
+            server_type = connection.get("type", "openapi")
+            info = connection.get("info", {})
+            old_oauth_clients[f"{server_type}:{info.get('id')}"] = info.get(
+                "oauth_client_info", ""
+            )
+
+    # Set new tool server connections
+    update_config(
+        request.app.state.config,
+        "TOOL_SERVER_CONNECTIONS",
+        form_data.model_dump()["TOOL_SERVER_CONNECTIONS"],
+    )
+
+    await set_tool_servers(request)
+
+    # Only MCP tool servers get an OAuth client
+    new_oauth_clients = {}
     for connection in request.app.state.config.TOOL_SERVER_CONNECTIONS:
         server_type = connection.get("type", "openapi")
+        info = connection.get("info", {})
+        server_id = info.get("id")
         auth_type = connection.get("auth_type", "none")
 
-        if auth_type == "oauth_2.1":
-            # Remove existing OAuth clients for tool servers
-            server_id = connection.get("info", {}).get("id")
-            client_key = f"{server_type}:{server_id}"
+        if server_type == "mcp" and auth_type == "oauth_2.1" and server_id:
+            new_oauth_clients[f"{server_type}:{server_id}"] = info.get(
+                "oauth_client_info", ""
+            )
 
+    # Only touch clients that were removed, added or changed
+    for client_key, oauth_client_info in old_oauth_clients.items():
+        if new_oauth_clients.get(client_key) != oauth_client_info:
             try:
-                request.app.state.oauth_client_manager.remove_client(client_key)
+                oauth_client_manager.remove_client(client_key)
             except:
                 pass
 
-    # Set new tool server connections
-    request.app.state.config.TOOL_SERVER_CONNECTIONS = [
-        connection.model_dump() for connection in form_data.TOOL_SERVER_CONNECTIONS
-    ]
-
-    await set_tool_servers(request)
+    for client_key, oauth_client_info in new_oauth_clients.items():
+        if (
+            old_oauth_clients.get(client_key) == oauth_client_info
+            and client_key in oauth_client_manager.clients
+        ):
+            continue
 
-    for connection in request.app.state.config.TOOL_SERVER_CONNECTIONS:
-        server_type = connection.get("type", "openapi")
-        if server_type == "mcp":
-            server_id = connection.get("info", {}).get("id")
-            auth_type = connection.get("auth_type", "none")
-
-            if auth_type == "oauth_2.1" and server_id:
-                try:
-                    oauth_client_info = connection.get("info", {}).get(
-                        "oauth_client_info", ""
-                    )
-                    oauth_client_info = decrypt_data(oauth_client_info)
+        try:
+            oauth_client_info = decrypt_data(oauth_client_info)
 
-                    request.app.state.oauth_client_manager.add_client(
-                        f"{server_type}:{server_id}",
-                        OAuthClientInformationFull(**oauth_client_info),
-                    )
-                except Exception as e:
-                    log.debug(f"Failed to add OAuth client for MCP tool server: {e}")
-                    continue
+            oauth_client_manager.add_client(
+                client_key,
+                OAuthClientInformationFull(**oauth_client_info),
+            )
+        except Exception as e:
+            log.debug(
+                "Failed to add OAuth client for MCP tool server %s: %s", client_key, e
+            )
+            continue
 
     return {
         "TOOL_SERVER_CONNECTIONS": request.app.state.config.TOOL_SERVER_CONNECTIONS,
     }
 
 
+async def fetch_oauth_server_metadata(
+    session, discovery_url: str
+) -> Optional[OAuthMetadata]:
+    """
+    Fetch a single OAuth 2.1 discovery document.
+
+    Returns None if the URL does not serve a document and raises ValueError
+    if it does but the document cannot be parsed.
+    """
+    log.debug(f"Trying to fetch OAuth 2.1 discovery document from {discovery_url}")
+    async with session.get(discovery_url) as oauth_server_metadata_response:
+        if oauth_server_metadata_response.status != 200:
+            return None
+
+        body = await oauth_server_metadata_response.read()
+        try:
+            return OAuthMetadata.model_validate_json(body)
+        except Exception as e:
+            raise ValueError(str(e)) from e
+
+
+async def get_tool_server_token(
+    request: Request, form_data: ToolServerConnection, user
+) -> Optional[str]:
+    """
+    Resolve the bearer token to send to a tool server for its auth_type.
+    """
+    token = None
+    if form_data.auth_type == "bearer":
+        token = form_data.key
+    elif form_data.auth_type == "session":
+        token = request.state.token.credentials
+    elif form_data.auth_type == "system_oauth":
+        oauth_session_id = request.cookies.get("oauth_session_id", None)
+        if oauth_session_id:
+            try:
+                oauth_token = await request.app.state.oauth_manager.get_oauth_token(
+                    user.id,
+                    oauth_session_id,
+                )
+
+                if oauth_token:
+                    token = oauth_token.get("access_token", "")
+            except Exception:
+                pass
+
+    return token
+
+
+def get_tool_server_headers(
+    token: Optional[str], extra_headers: Optional[dict | str]
+) -> Optional[dict]:
+    """
+    Build tool server request headers from a bearer token and any custom
+    connection headers. Returns None if there are no headers to send.
+    """
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    if extra_headers and isinstance(extra_headers, dict):
+        headers.update(extra_headers)
+
+    return headers or None
+
+
 @router.post("/tool_servers/verify")
 async def verify_tool_servers_config(
     request: Request, form_data: ToolServerConnection, user=Depends(get_admin_user)
@@ -231,39 +357,80 @@ async def verify_tool_servers_config(
     try:
         if form_data.type == "mcp":
             if form_data.auth_type == "oauth_2.1":
-                discovery_urls = get_discovery_urls(form_data.url)
-                for discovery_url in discovery_urls:
-                    log.debug(
-                        f"Trying to fetch OAuth 2.1 discovery document from {discovery_url}"
+                cached = OAUTH_SERVER_METADATA_CACHE.get(form_data.url)
+                if cached:
+                    if cached[0] > time.monotonic():
+                        return {
+                            "status": True,
+                            "oauth_server_metadata": cached[1],
+                        }
+                    OAUTH_SERVER_METADATA_CACHE.pop(form_data.url, None)
+
+                discovery_urls = await get_discovery_urls(form_data.url)
+                session = request.app.state.http_session
+
+                # Probe all candidates concurrently, but await them in the
+                # priority order of get_discovery_urls so the first usable
+                # document wins without waiting on slower, lower-priority ones
+                tasks = [
+                    asyncio.create_task(
+                        fetch_oauth_server_metadata(session, discovery_url)
                     )
-                    async with aiohttp.ClientSession(
-                        trust_env=True,
-                        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-                    ) as session:
-                        async with session.get(
-                            discovery_url
-                        ) as oauth_server_metadata_response:
-                            if oauth_server_metadata_response.status == 200:
-                                try:
-                                    oauth_server_metadata = (
-                                        OAuthMetadata.model_validate(
-                                            await oauth_server_metadata_response.json()
-                                        )
-                                    )
-                                    return {
-                                        "status": True,
-                                        "oauth_server_metadata": oauth_server_metadata.model_dump(
-                                            mode="json"
-                                        ),
-                                    }
-                                except Exception as e:
-                                    log.info(
-                                        f"Failed to parse OAuth 2.1 discovery document: {e}"
-                                    )
-                                    raise HTTPException(
-                                        status_code=400,
-                                        detail=f"Failed to parse OAuth 2.1 discovery document from {discovery_url}",
+                    for discovery_url in discovery_urls
+                ]
+                try:
+                    for discovery_url, task in zip(discovery_urls, tasks):
+                        try:
+                            oauth_server_metadata = await task
+                        except ValueError as e:
+                            log.info(
+                                f"Failed to parse OAuth 2.1 discovery document: {e}"
+                            )
+                            raise HTTPException(
+                                status_code=400,
+                                detail=f"Failed to parse OAuth 2.1 discovery document from {discovery_url}",
+                            )
+                        except Exception as e:
+                            log.debug(
+                                f"Failed to fetch OAuth 2.1 discovery document from {discovery_url}: {e}"
+                            )
+                            continue
+
+                        if oauth_server_metadata is None:
+                            continue
+
+                        oauth_server_metadata = oauth_server_metadata.model_dump(
+                            mode="json"
+                        )
+                        if OAUTH_DISCOVERY_CACHE_TTL > 0:
+                            now = time.monotonic()
+                            if (
+                                len(OAUTH_SERVER_METADATA_CACHE)
+                                >= OAUTH_SERVER_METADATA_CACHE_MAX_ENTRIES
+                            ):
+                                for key, (expires_at, _) in list(
+                                    OAUTH_SERVER_METADATA_CACHE.items()
+                                ):
+                                    if expires_at <= now:
+                                        del OAUTH_SERVER_METADATA_CACHE[key]
+                                if (
+                                    len(OAUTH_SERVER_METADATA_CACHE)
+                                    >= OAUTH_SERVER_METADATA_CACHE_MAX_ENTRIES
+                                ):
+                                    OAUTH_SERVER_METADATA_CACHE.pop(
+                                        next(iter(OAUTH_SERVER_METADATA_CACHE))
                                     )
+                            OAUTH_SERVER_METADATA_CACHE[form_data.url] = (
+                                now + OAUTH_DISCOVERY_CACHE_TTL,
+                                oauth_server_metadata,
+                            )
+                        return {
+                            "status": True,
+                            "oauth_server_metadata": oauth_server_metadata,
+                        }
+                finally:
+                    for task in tasks:
+                        task.cancel()
 
                 raise HTTPException(
                     status_code=400,
@@ -272,33 +439,9 @@ async def verify_tool_servers_config(
             else:
                 try:
                     client = MCPClient()
-                    headers = None
-
-                    token = None
-                    if form_data.auth_type == "bearer":
-                        token = form_data.key
-                    elif form_data.auth_type == "session":
-                        token = request.state.token.credentials
-                    elif form_data.auth_type == "system_oauth":
-                        oauth_token = None
-                        try:
-                            if request.cookies.get("oauth_session_id", None):
-                                oauth_token = await request.app.state.oauth_manager.get_oauth_token(
-                                    user.id,
-                                    request.cookies.get("oauth_session_id", None),
-                                )
-
-                                if oauth_token:
-                                    token = oauth_token.get("access_token", "")
-                        except Exception as e:
-                            pass
-                    if token:
-                        headers = {"Authorization": f"Bearer {token}"}
 
-                    if form_data.headers and isinstance(form_data.headers, dict):
-                        if headers is None:
-                            headers = {}
-                        headers.update(form_data.headers)
+                    token = await get_tool_server_token(request, form_data, user)
+                    headers = get_tool_server_headers(token, form_data.headers)
 
                     await client.connect(form_data.url, headers=headers)
                     specs = await client.list_tool_specs()
@@ -318,36 +461,12 @@ async def verify_tool_servers_config(
         elif form_data.type == "shepherd":
             try:
                 client = ShepherdClient()
-                headers = None
-
-                token = None
-                if form_data.auth_type == "bearer":
-                    token = form_data.key
-                elif form_data.auth_type == "session":
-                    token = request.state.token.credentials
-                elif form_data.auth_type == "system_oauth":
-                    oauth_token = None
-                    try:
-                        if request.cookies.get("oauth_session_id", None):
-                            oauth_token = await request.app.state.oauth_manager.get_oauth_token(
-                                user.id,
-                                request.cookies.get("oauth_session_id", None),
-                            )
 
-                            if oauth_token:
-                                token = oauth_token.get("access_token", "")
-                    except Exception:
-                        pass
-                if token:
-                    headers = {"Authorization": f"Bearer {token}"}
-
-                if form_data.headers and isinstance(form_data.headers, dict):
-                    if headers is None:
-                        headers = {}
-                    headers.update(form_data.headers)
+                token = await get_tool_server_token(request, form_data, user)
+                headers = get_tool_server_headers(token, form_data.headers)
 
                 await client.connect(form_data.url, headers=headers)
-                specs = await client.list_tool_specs()
+                specs = await client.list_tool_specs(use_cache=False)
                 return {
                     "status": True,
                     "specs": specs,
@@ -362,38 +481,13 @@ async def verify_tool_servers_config(
                 if client:
                     await client.disconnect()
         else:  # openapi
-            token = None
-            headers = None
-            if form_data.auth_type == "bearer":
-                token = form_data.key
-            elif form_data.auth_type == "session":
-                token = request.state.token.credentials
-            elif form_data.auth_type == "system_oauth":
-                try:
-                    if request.cookies.get("oauth_session_id", None):
-                        oauth_token = (
-                            await request.app.state.oauth_manager.get_oauth_token(
-                                user.id,
-                                request.cookies.get("oauth_session_id", None),
-                            )
-                        )
-
-                        if oauth_token:
-                            token = oauth_token.get("access_token", "")
-
-                except Exception as e:
-                    pass
-
-            if token:
-                headers = {"Authorization": f"Bearer {token}"}
-
-            if form_data.headers and isinstance(form_data.headers, dict):
-                if headers is None:
-                    headers = {}
-                headers.update(form_data.headers)
+            token = await get_tool_server_token(request, form_data, user)
+            headers = get_tool_server_headers(token, form_data.headers)
 
             url = get_tool_server_url(form_data.url, form_data.path)
-            return await get_tool_server_data(url, headers=headers)
+            return await get_tool_server_data(
+                url, headers=headers, session=request.app.state.http_session
+            )
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -404,6 +498,15 @@ async def verify_tool_servers_config(
         )
 
 
+@router.delete("/oauth/discovery-cache")
+async def clear_oauth_discovery_cache(user=Depends(get_admin_user)):
+    """
+    Clear cached OAuth 2.1 discovery documents.
+    """
+    OAUTH_SERVER_METADATA_CACHE.clear()
+    return {"status": True}
+
+
 ############################
 # CodeInterpreterConfig
 ############################
@@ -425,92 +528,25 @@ class CodeInterpreterConfigForm(BaseModel):
     CODE_INTERPRETER_JUPYTER_TIMEOUT: Optional[int]
 
 
-@router.get("/code_execution", response_model=CodeInterpreterConfigForm)
+CODE_EXECUTION_CONFIG_KEYS = tuple(CodeInterpreterConfigForm.model_fields)
+
+
+@router.get("/code_execution", response_model=None)
 async def get_code_execution_config(request: Request, user=Depends(get_admin_user)):
-    return {
-        "ENABLE_CODE_EXECUTION": request.app.state.config.ENABLE_CODE_EXECUTION,
-        "CODE_EXECUTION_ENGINE": request.app.state.config.CODE_EXECUTION_ENGINE,
-        "CODE_EXECUTION_JUPYTER_URL": request.app.state.config.CODE_EXECUTION_JUPYTER_URL,
-        "CODE_EXECUTION_JUPYTER_AUTH": request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH,
-        "CODE_EXECUTION_JUPYTER_AUTH_TOKEN": request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_TOKEN,
-        "CODE_EXECUTION_JUPYTER_AUTH_PASSWORD": request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD,
-        "CODE_EXECUTION_JUPYTER_TIMEOUT": request.app.state.config.CODE_EXECUTION_JUPYTER_TIMEOUT,
-        "ENABLE_CODE_INTERPRETER": request.app.state.config.ENABLE_CODE_INTERPRETER,
-        "CODE_INTERPRETER_ENGINE": request.app.state.config.CODE_INTERPRETER_ENGINE,
-        "CODE_INTERPRETER_PROMPT_TEMPLATE": request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE,
-        "CODE_INTERPRETER_JUPYTER_URL": request.app.state.config.CODE_INTERPRETER_JUPYTER_URL,
-        "CODE_INTERPRETER_JUPYTER_AUTH": request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH,
-        "CODE_INTERPRETER_JUPYTER_AUTH_TOKEN": request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN,
-        "CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD": request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD,
-        "CODE_INTERPRETER_JUPYTER_TIMEOUT": request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
-    }
+    config = request.app.state.config
+    return {key: getattr(config, key) for key in CODE_EXECUTION_CONFIG_KEYS}
 
 
 @router.post("/code_execution", response_model=CodeInterpreterConfigForm)
 async def set_code_execution_config(
     request: Request, form_data: CodeInterpreterConfigForm, user=Depends(get_admin_user)
 ):
+    config = request.app.state.config
+    data = form_data.model_dump()
+    for key in CODE_EXECUTION_CONFIG_KEYS:
+        update_config(config, key, data[key])
 
-    request.app.state.config.ENABLE_CODE_EXECUTION = form_data.ENABLE_CODE_EXECUTION
-
-    request.app.state.config.CODE_EXECUTION_ENGINE = form_data.CODE_EXECUTION_ENGINE
-    request.app.state.config.CODE_EXECUTION_JUPYTER_URL = (
-        form_data.CODE_EXECUTION_JUPYTER_URL
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH = (
-        form_data.CODE_EXECUTION_JUPYTER_AUTH
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_TOKEN = (
-        form_data.CODE_EXECUTION_JUPYTER_AUTH_TOKEN
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD = (
-        form_data.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD
-    )
-    request.app.state.config.CODE_EXECUTION_JUPYTER_TIMEOUT = (
-        form_data.CODE_EXECUTION_JUPYTER_TIMEOUT
-    )
-
-    request.app.state.config.ENABLE_CODE_INTERPRETER = form_data.ENABLE_CODE_INTERPRETER
-    request.app.state.config.CODE_INTERPRETER_ENGINE = form_data.CODE_INTERPRETER_ENGINE
-    request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE = (
-        form_data.CODE_INTERPRETER_PROMPT_TEMPLATE
-    )
-
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_URL = (
-        form_data.CODE_INTERPRETER_JUPYTER_URL
-    )
-
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH = (
-        form_data.CODE_INTERPRETER_JUPYTER_AUTH
-    )
-
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN = (
-        form_data.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN
-    )
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD = (
-        form_data.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD
-    )
-    request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT = (
-        form_data.CODE_INTERPRETER_JUPYTER_TIMEOUT
-    )
-
-    return {
-        "ENABLE_CODE_EXECUTION": request.app.state.config.ENABLE_CODE_EXECUTION,
-        "CODE_EXECUTION_ENGINE": request.app.state.config.CODE_EXECUTION_ENGINE,
-        "CODE_EXECUTION_JUPYTER_URL": request.app.state.config.CODE_EXECUTION_JUPYTER_URL,
-        "CODE_EXECUTION_JUPYTER_AUTH": request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH,
-        "CODE_EXECUTION_JUPYTER_AUTH_TOKEN": request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_TOKEN,
-        "CODE_EXECUTION_JUPYTER_AUTH_PASSWORD": request.app.state.config.CODE_EXECUTION_JUPYTER_AUTH_PASSWORD,
-        "CODE_EXECUTION_JUPYTER_TIMEOUT": request.app.state.config.CODE_EXECUTION_JUPYTER_TIMEOUT,
-        "ENABLE_CODE_INTERPRETER": request.app.state.config.ENABLE_CODE_INTERPRETER,
-        "CODE_INTERPRETER_ENGINE": request.app.state.config.CODE_INTERPRETER_ENGINE,
-        "CODE_INTERPRETER_PROMPT_TEMPLATE": request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE,
-        "CODE_INTERPRETER_JUPYTER_URL": request.app.state.config.CODE_INTERPRETER_JUPYTER_URL,
-        "CODE_INTERPRETER_JUPYTER_AUTH": request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH,
-        "CODE_INTERPRETER_JUPYTER_AUTH_TOKEN": request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_TOKEN,
-        "CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD": request.app.state.config.CODE_INTERPRETER_JUPYTER_AUTH_PASSWORD,
-        "CODE_INTERPRETER_JUPYTER_TIMEOUT": request.app.state.config.CODE_INTERPRETER_JUPYTER_TIMEOUT,
-    }
+    return data
 
 
 ############################
@@ -526,46 +562,26 @@ class ModelsConfigForm(BaseModel):
     ENABLE_TEMPORARY_CHAT: Optional[bool] = None
 
 
-@router.get("/models", response_model=ModelsConfigForm)
+MODELS_CONFIG_KEYS = tuple(ModelsConfigForm.model_fields)
+
+
+@router.get("/models", response_model=None)
 async def get_models_config(request: Request, user=Depends(get_admin_user)):
-    return {
-        "DEFAULT_MODELS": request.app.state.config.DEFAULT_MODELS,
-        "DEFAULT_PINNED_MODELS": request.app.state.config.DEFAULT_PINNED_MODELS,
-        "MODEL_ORDER_LIST": request.app.state.config.MODEL_ORDER_LIST,
-        "ENABLE_MODEL_SELECTOR": request.app.state.config.ENABLE_MODEL_SELECTOR,
-        "ENABLE_INTEGRATIONS_MENU": request.app.state.config.ENABLE_INTEGRATIONS_MENU,
-        "ENABLE_CHAT_CONTROLS": request.app.state.config.ENABLE_CHAT_CONTROLS,
-        "ENABLE_TEMPORARY_CHAT": request.app.state.config.ENABLE_TEMPORARY_CHAT,
-    }
+    config = request.app.state.config
+    return {key: getattr(config, key) for key in MODELS_CONFIG_KEYS}
 
 
 @router.post("/models", response_model=ModelsConfigForm)
 async def set_models_config(
     request: Request, form_data: ModelsConfigForm, user=Depends(get_admin_user)
 ):
-    if form_data.DEFAULT_MODELS is not None:
-        request.app.state.config.DEFAULT_MODELS = form_data.DEFAULT_MODELS
-    if form_data.DEFAULT_PINNED_MODELS is not None:
-        request.app.state.config.DEFAULT_PINNED_MODELS = form_data.DEFAULT_PINNED_MODELS
-    if form_data.MODEL_ORDER_LIST is not None:
-        request.app.state.config.MODEL_ORDER_LIST = form_data.MODEL_ORDER_LIST
-    if form_data.ENABLE_MODEL_SELECTOR is not None:
-        request.app.state.config.ENABLE_MODEL_SELECTOR = form_data.ENABLE_MODEL_SELECTOR
-    if form_data.ENABLE_INTEGRATIONS_MENU is not None:
-        request.app.state.config.ENABLE_INTEGRATIONS_MENU = form_data.ENABLE_INTEGRATIONS_MENU
-    if form_data.ENABLE_CHAT_CONTROLS is not None:
-        request.app.state.config.ENABLE_CHAT_CONTROLS = form_data.ENABLE_CHAT_CONTROLS
-    if form_data.ENABLE_TEMPORARY_CHAT is not None:
-        request.app.state.config.ENABLE_TEMPORARY_CHAT = form_data.ENABLE_TEMPORARY_CHAT
-    return {
-        "DEFAULT_MODELS": request.app.state.config.DEFAULT_MODELS,
-        "DEFAULT_PINNED_MODELS": request.app.state.config.DEFAULT_PINNED_MODELS,
-        "MODEL_ORDER_LIST": request.app.state.config.MODEL_ORDER_LIST,
-        "ENABLE_MODEL_SELECTOR": request.app.state.config.ENABLE_MODEL_SELECTOR,
-        "ENABLE_INTEGRATIONS_MENU": request.app.state.config.ENABLE_INTEGRATIONS_MENU,
-        "ENABLE_CHAT_CONTROLS": request.app.state.config.ENABLE_CHAT_CONTROLS,
-        "ENABLE_TEMPORARY_CHAT": request.app.state.config.ENABLE_TEMPORARY_CHAT,
-    }
+    config = request.app.state.config
+    data = form_data.model_dump()
+    for key in MODELS_CONFIG_KEYS:
+        if data[key] is not None:
+            update_config(config, key, data[key])
+
+    return {key: getattr(config, key) for key in MODELS_CONFIG_KEYS}
 
 
 class PromptSuggestion(BaseModel):
@@ -584,7 +600,9 @@ async def set_default_suggestions(
     user=Depends(get_admin_user),
 ):
     data = form_data.model_dump()
-    request.app.state.config.DEFAULT_PROMPT_SUGGESTIONS = data["suggestions"]
+    update_config(
+        request.app.state.config, "DEFAULT_PROMPT_SUGGESTIONS", data["suggestions"]
+    )
     return request.app.state.config.DEFAULT_PROMPT_SUGGESTIONS
 
 
@@ -604,16 +622,20 @@ async def set_banners(
     user=Depends(get_admin_user),
 ):
     data = form_data.model_dump()
-    request.app.state.config.BANNERS = data["banners"]
+    update_config(request.app.state.config, "BANNERS", data["banners"])
     return request.app.state.config.BANNERS
 
 
+BANNERS_ADAPTER = TypeAdapter(list[BannerModel])
+
+
 @router.get("/banners", response_model=list[BannerModel])
 async def get_banners(
     request: Request,
     user=Depends(get_verified_user),
 ):
-    return request.app.state.config.BANNERS
+    banners = BANNERS_ADAPTER.validate_python(request.app.state.config.BANNERS)
+    return etag_json_response(request, BANNERS_ADAPTER.dump_json(banners))
 
 
 ############################
@@ -629,23 +651,30 @@ class BrandingConfigForm(BaseModel):
 
 @router.get("/branding")
 async def get_branding_config(request: Request, user=Depends(get_verified_user)):
-    return {
-        "CUSTOM_NAME": request.app.state.config.CUSTOM_NAME,
-        "CUSTOM_LOGO": request.app.state.config.CUSTOM_LOGO,
-        "ENABLE_SPLASH_SCREEN": request.app.state.config.ENABLE_SPLASH_SCREEN,
-    }
+    return etag_json_response(
+        request,
+        orjson.dumps(
+            {
+                "CUSTOM_NAME": request.app.state.config.CUSTOM_NAME,
+                "CUSTOM_LOGO": request.app.state.config.CUSTOM_LOGO,
+                "ENABLE_SPLASH_SCREEN": request.app.state.config.ENABLE_SPLASH_SCREEN,
+            }
+        ),
+    )
 
 
 @router.post("/branding")
 async def set_branding_config(
     request: Request, form_data: BrandingConfigForm, user=Depends(get_admin_user)
 ):
+    config = request.app.state.config
     if form_data.CUSTOM_NAME is not None:
-        request.app.state.config.CUSTOM_NAME = form_data.CUSTOM_NAME
+        update_config(config, "CUSTOM_NAME", form_data.CUSTOM_NAME)
     if form_data.CUSTOM_LOGO is not None:
-        request.app.state.config.CUSTOM_LOGO = form_data.CUSTOM_LOGO
+        if update_config(config, "CUSTOM_LOGO", form_data.CUSTOM_LOGO):
+            request.app.state.branding_logo_path = None
     if form_data.ENABLE_SPLASH_SCREEN is not None:
-        request.app.state.config.ENABLE_SPLASH_SCREEN = form_data.ENABLE_SPLASH_SCREEN
+        update_config(config, "ENABLE_SPLASH_SCREEN", form_data.ENABLE_SPLASH_SCREEN)
     return {
         "CUSTOM_NAME": request.app.state.config.CUSTOM_NAME,
         "CUSTOM_LOGO": request.app.state.config.CUSTOM_LOGO,
@@ -653,6 +682,25 @@ async def set_branding_config(
     }
 
 
+BRANDING_LOGO_ALLOWED_TYPES = frozenset(
+    {"image/png", "image/jpeg", "image/svg+xml", "image/webp"}
+)
+BRANDING_LOGO_ALLOWED_TYPES_STR = ", ".join(sorted(BRANDING_LOGO_ALLOWED_TYPES))
+BRANDING_LOGO_MAX_SIZE = 5 * 1024 * 1024  # 5 MiB
+BRANDING_LOGO_CHUNK_SIZE = 1024 * 1024
+BRANDING_LOGO_HEADERS = {"Cache-Control": "public, max-age=3600"}
+BRANDING_LOGO_IMMUTABLE_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable"
+}
+# Uploaded logos are named after their content hash: logo.<md5>.<ext>
+BRANDING_LOGO_HASH_PATTERN = re.compile(r"logo\.([0-9a-f]{32})\.[^./]+$")
+
+
+def remove_branding_logos():
+    for existing in BRANDING_DIR.glob("logo.*"):
+        existing.unlink()
+
+
 @router.post("/branding/logo")
 async def upload_branding_logo(
     request: Request,
@@ -660,33 +708,52 @@ async def upload_branding_logo(
     user=Depends(get_admin_user),
 ):
     """Upload a custom logo for branding."""
-    # Create branding directory if it doesn't exist
-    branding_dir = Path(DATA_DIR) / "branding"
-    branding_dir.mkdir(parents=True, exist_ok=True)
-
     # Validate file type
-    allowed_types = ["image/png", "image/jpeg", "image/svg+xml", "image/webp"]
-    if file.content_type not in allowed_types:
+    if file.content_type not in BRANDING_LOGO_ALLOWED_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}",
+            detail=f"Invalid file type. Allowed types: {BRANDING_LOGO_ALLOWED_TYPES_STR}",
         )
 
+    if file.size is not None and file.size > BRANDING_LOGO_MAX_SIZE:
+        raise HTTPException(status_code=400, detail="Logo file is too large")
+
     # Save file as logo with appropriate extension
     ext = file.filename.split(".")[-1] if "." in file.filename else "png"
-    logo_path = branding_dir / f"logo.{ext}"
-
-    # Remove any existing logo files
-    for existing in branding_dir.glob("logo.*"):
-        existing.unlink()
 
-    # Save the new logo
-    with open(logo_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    # Stream the upload to a temporary file without blocking the event loop,
+    # so a failed or oversized upload leaves the current logo in place. The
+    # name is unique so concurrent uploads never write to the same file.
+    fd, upload_path = tempfile.mkstemp(dir=BRANDING_DIR, prefix=".logo.")
+    os.close(fd)
+    upload_path = Path(upload_path)
+    written = 0
+    digest = hashlib.md5(usedforsecurity=False)
+    try:
+        async with aiofiles.open(upload_path, "wb") as f:
+            while chunk := await file.read(BRANDING_LOGO_CHUNK_SIZE):
+                written += len(chunk)
+                if written > BRANDING_LOGO_MAX_SIZE:
+                    raise HTTPException(
+                        status_code=400, detail="Logo file is too large"
+                    )
+                digest.update(chunk)
+                await f.write(chunk)
+    except Exception:
+        upload_path.unlink(missing_ok=True)
+        raise
+
+    # Replace any existing logo files with the new logo, named after its
+    # content hash so browsers can cache it indefinitely
+    logo_filename = f"logo.{digest.hexdigest()}.{ext}"
+    logo_path = BRANDING_DIR / logo_filename
+    await run_in_threadpool(remove_branding_logos)
+    upload_path.replace(logo_path)
 
     # Update config to point to the logo
-    relative_path = f"branding/logo.{ext}"
+    relative_path = f"branding/{logo_filename}"
     request.app.state.config.CUSTOM_LOGO = relative_path
+    request.app.state.branding_logo_path = (relative_path, logo_path)
 
     return {"CUSTOM_LOGO": relative_path}
 
@@ -696,9 +763,27 @@ async def get_branding_logo(request: Request):
     """Serve the custom logo if it exists, otherwise return default."""
     custom_logo = request.app.state.config.CUSTOM_LOGO
     if custom_logo:
-        logo_path = Path(DATA_DIR) / custom_logo
-        if logo_path.exists():
-            return FileResponse(logo_path)
+        # (CUSTOM_LOGO, resolved path) of the last logo known to exist
+        cached = request.app.state.branding_logo_path
+        if not (cached and cached[0] == custom_logo):
+            logo_path = DATA_DIR / custom_logo
+            cached = (custom_logo, logo_path) if logo_path.exists() else None
+            request.app.state.branding_logo_path = cached
+
+        if cached:
+            headers = BRANDING_LOGO_HEADERS
+            match = BRANDING_LOGO_HASH_PATTERN.search(custom_logo)
+            if match:
+                etag = f'"{match.group(1)}"'
+                if etag_matches(request, etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+
+                # Versioned URLs (?v=<CUSTOM_LOGO>) never change content
+                if request.query_params.get("v") == custom_logo:
+                    headers = BRANDING_LOGO_IMMUTABLE_HEADERS
+                headers = {**headers, "ETag": etag}
+
+            return FileResponse(cached[1], headers=headers)
 
     # Return 404 if no custom logo - frontend will use default
     raise HTTPException(status_code=404, detail="No custom logo configured")
@@ -710,13 +795,11 @@ async def delete_branding_logo(
     user=Depends(get_admin_user),
 ):
     """Delete the custom logo and revert to default."""
-    branding_dir = Path(DATA_DIR) / "branding"
-
     # Remove any existing logo files
-    for existing in branding_dir.glob("logo.*"):
-        existing.unlink()
+    await run_in_threadpool(remove_branding_logos)
 
     # Clear the config
     request.app.state.config.CUSTOM_LOGO = ""
+    request.app.state.branding_logo_path = None
 
     return {"CUSTOM_LOGO": ""}
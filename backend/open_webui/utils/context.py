@@ -6,15 +6,69 @@ Based on Shepherd's two-pass eviction strategy (session.cpp).
 """
 
 import re
-import json
+import orjson
 import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import compress
 from typing import Optional
 
+__all__ = [
+    "MAX_CONTEXT_RETRIES",
+    "MessageView",
+    "is_context_overflow_error",
+    "parse_overflow_error",
+    "compute_chars_per_token_ema",
+    "estimate_tokens",
+    "compute_message_tokens",
+    "calculate_turns_to_evict",
+    "evict_messages",
+    "evict_messages_fallback",
+]
+
 log = logging.getLogger(__name__)
 
 # Maximum retry attempts for context overflow
 MAX_CONTEXT_RETRIES = 3
 
+# Keywords that mark an error as a context overflow, matched in a single pass
+OVERFLOW_KEYWORDS = (
+    "context length",
+    "maximum context",
+    "token limit",
+    "too many tokens",
+    "context size",
+    "n_ctx",
+    "exceed",
+    "tokens but limit",
+)
+OVERFLOW_KEYWORDS_PATTERN = re.compile(
+    "|".join(map(re.escape, OVERFLOW_KEYWORDS)), re.IGNORECASE
+)
+
+# Overflow error formats (see parse_overflow_error)
+SHEPHERD_PATTERN = re.compile(r"would need (\d+) tokens but limit is (\d+)")
+OPENAI_CLASSIC_PATTERN = re.compile(
+    r"maximum context length is (\d+) tokens.*?resulted in (\d+) tokens",
+    re.IGNORECASE | re.DOTALL,
+)
+TOO_LARGE_PATTERN = re.compile(r"is too large: (\d+)")
+MAX_CONTEXT_PATTERN = re.compile(r"maximum context length is (\d+)", re.IGNORECASE)
+REQUEST_HAS_PATTERN = re.compile(r"your request has (\d+)", re.IGNORECASE)
+OPENAI_DETAILED_PATTERN = re.compile(
+    r"maximum context length is (\d+).*?you requested (\d+) tokens",
+    re.IGNORECASE | re.DOTALL,
+)
+# Literal anchors of the formats above, found in one scan. The lookahead lets
+# overlapping anchors match; case sensitivity mirrors each format's pattern.
+OVERFLOW_ANCHORS_PATTERN = re.compile(
+    r"(?=(would need|is too large"
+    r"|(?i:maximum context length is|your request has|you requested)))"
+)
+LLAMACPP_PATTERN = re.compile(
+    r'"n_prompt_tokens"\s*:\s*(\d+).*?"n_ctx"\s*:\s*(\d+)', re.DOTALL
+)
+
 
 def is_context_overflow_error(error_response: dict | str) -> bool:
     """
@@ -37,20 +91,16 @@ def is_context_overflow_error(error_response: dict | str) -> bool:
     else:
         error_msg = str(error_response)
 
-    error_msg = error_msg.lower()
-
-    keywords = [
-        "context length",
-        "maximum context",
-        "token limit",
-        "too many tokens",
-        "context size",
-        "n_ctx",
-        "exceed",
-        "tokens but limit",
-    ]
+    if not isinstance(error_msg, str):
+        error_msg = str(error_msg)
+
+    return _is_context_overflow_str(error_msg)
 
-    return any(kw in error_msg for kw in keywords)
+
+# Retries re-classify the same backend error, so results are cached per message
+@lru_cache(maxsize=256)
+def _is_context_overflow_str(error_msg: str) -> bool:
+    return OVERFLOW_KEYWORDS_PATTERN.search(error_msg) is not None
 
 
 def parse_overflow_error(error_message: str) -> int:
@@ -71,25 +121,53 @@ def parse_overflow_error(error_message: str) -> int:
     Returns:
         Number of tokens to evict (actual - max), or -1 if can't parse
     """
+    if not error_message:
+        return -1
+
+    return _parse_overflow_error_str(str(error_message))
+
+
+@lru_cache(maxsize=256)
+def _parse_overflow_error_str(error_message: str) -> int:
     actual_tokens = -1
     max_tokens = -1
 
-    # Try to parse as JSON first (llama.cpp format)
-    try:
-        parsed = json.loads(error_message)
-        if isinstance(parsed, dict):
-            error_obj = parsed.get("error", parsed)
-            if isinstance(error_obj, dict):
-                n_prompt = error_obj.get("n_prompt_tokens", -1)
-                n_ctx = error_obj.get("n_ctx", -1)
-                if n_prompt > 0 and n_ctx > 0:
-                    log.debug(f"Parsed llama.cpp JSON: n_prompt={n_prompt}, n_ctx={n_ctx}")
-                    return n_prompt - n_ctx
-    except (json.JSONDecodeError, TypeError):
-        pass
+    # Try to parse as JSON first (llama.cpp format), only if it looks like an object
+    first = error_message[0]
+    if first == "{" or (first.isspace() and error_message.lstrip().startswith("{")):
+        # llama.cpp puts both counts at the end of the error object; pull them
+        # out directly and only fall back to a full parse if that fails
+        match = LLAMACPP_PATTERN.search(error_message)
+        if match:
+            n_prompt = int(match.group(1))
+            n_ctx = int(match.group(2))
+            if n_prompt > 0 and n_ctx > 0:
+                log.debug(f"Parsed llama.cpp JSON: n_prompt={n_prompt}, n_ctx={n_ctx}")
+                return n_prompt - n_ctx
+
+        try:
+            parsed = orjson.loads(error_message)
+            if isinstance(parsed, dict):
+                error_obj = parsed.get("error", parsed)
+                if isinstance(error_obj, dict):
+                    n_prompt = error_obj.get("n_prompt_tokens", -1)
+                    n_ctx = error_obj.get("n_ctx", -1)
+                    if n_prompt > 0 and n_ctx > 0:
+                        log.debug(f"Parsed llama.cpp JSON: n_prompt={n_prompt}, n_ctx={n_ctx}")
+                        return n_prompt - n_ctx
+        except (orjson.JSONDecodeError, TypeError):
+            pass
+
+    # Anchors present in the message gate each format regex, so non-matching
+    # messages skip those scans
+    anchors = {
+        match.group(1).lower()
+        for match in OVERFLOW_ANCHORS_PATTERN.finditer(error_message)
+    }
+    has_max_context = "maximum context length is" in anchors
 
     # Shepherd format: "would need X tokens but limit is Y tokens"
-    match = re.search(r"would need (\d+) tokens but limit is (\d+)", error_message)
+    match = "would need" in anchors and SHEPHERD_PATTERN.search(error_message)
     if match:
         actual_tokens = int(match.group(1))
         max_tokens = int(match.group(2))
@@ -97,11 +175,7 @@ def parse_overflow_error(error_message: str) -> int:
         return actual_tokens - max_tokens
 
     # OpenAI classic: "maximum context length is X tokens. However, your messages resulted in Y tokens"
-    match = re.search(
-        r"maximum context length is (\d+) tokens.*?resulted in (\d+) tokens",
-        error_message,
-        re.IGNORECASE | re.DOTALL,
-    )
+    match = has_max_context and OPENAI_CLASSIC_PATTERN.search(error_message)
     if match:
         max_tokens = int(match.group(1))
         actual_tokens = int(match.group(2))
@@ -109,9 +183,13 @@ def parse_overflow_error(error_message: str) -> int:
         return actual_tokens - max_tokens
 
     # vLLM MAX_TOKENS_TOO_HIGH: "is too large: X. ... maximum context length is Y ... your request has Z input tokens"
-    too_large_match = re.search(r"is too large: (\d+)", error_message)
-    max_ctx_match = re.search(r"maximum context length is (\d+)", error_message, re.IGNORECASE)
-    request_match = re.search(r"your request has (\d+)", error_message, re.IGNORECASE)
+    too_large_match = "is too large" in anchors and TOO_LARGE_PATTERN.search(
+        error_message
+    )
+    max_ctx_match = has_max_context and MAX_CONTEXT_PATTERN.search(error_message)
+    request_match = "your request has" in anchors and REQUEST_HAS_PATTERN.search(
+        error_message
+    )
 
     if too_large_match and max_ctx_match and request_match:
         max_tokens_requested = int(too_large_match.group(1))
@@ -132,10 +210,10 @@ def parse_overflow_error(error_message: str) -> int:
         return actual_tokens - max_tokens
 
     # OpenAI detailed: "you requested X tokens (Y in the messages, Z in the completion)"
-    match = re.search(
-        r"maximum context length is (\d+).*?you requested (\d+) tokens",
-        error_message,
-        re.IGNORECASE | re.DOTALL,
+    match = (
+        has_max_context
+        and "you requested" in anchors
+        and OPENAI_DETAILED_PATTERN.search(error_message)
     )
     if match:
         max_tokens = int(match.group(1))
@@ -147,7 +225,57 @@ def parse_overflow_error(error_message: str) -> int:
     return -1
 
 
-def compute_chars_per_token_ema(messages: list[dict]) -> float:
+# Integer role codes used by MessageView; unknown roles map to ROLE_OTHER
+ROLE_OTHER = -1
+ROLE_SYSTEM = 0
+ROLE_USER = 1
+ROLE_ASSISTANT = 2
+ROLE_TOOL = 3
+ROLE_CODES = {
+    "system": ROLE_SYSTEM,
+    "user": ROLE_USER,
+    "assistant": ROLE_ASSISTANT,
+    "tool": ROLE_TOOL,
+}
+
+
+@dataclass(slots=True)
+class MessageView:
+    """Per-message fields extracted once and shared by the eviction passes."""
+
+    roles: list[int]  # ROLE_* codes
+    prompt_tokens: list[int]  # assistant messages only, 0 elsewhere
+    completion_tokens: list[int]  # assistant messages only, 0 elsewhere
+    content_lens: list[int]
+    ids: list
+
+
+def _to_message_view(messages: list[dict]) -> MessageView:
+    n = len(messages)
+    roles = [ROLE_OTHER] * n
+    prompt_tokens = [0] * n
+    completion_tokens = [0] * n
+    content_lens = [0] * n
+    ids = [None] * n
+
+    for i, msg in enumerate(messages):
+        role = ROLE_CODES.get(msg.get("role"), ROLE_OTHER)
+        roles[i] = role
+        content = msg.get("content", "")
+        content_lens[i] = len(content) if content else 0
+        ids[i] = msg.get("id")
+        if role == ROLE_ASSISTANT:
+            usage = msg.get("usage", {})
+            if usage:
+                prompt_tokens[i] = usage.get("prompt_tokens", 0)
+                completion_tokens[i] = usage.get("completion_tokens", 0)
+
+    return MessageView(roles, prompt_tokens, completion_tokens, content_lens, ids)
+
+
+def compute_chars_per_token_ema(
+    messages: list[dict], view: Optional[MessageView] = None
+) -> float:
     """
     Compute chars_per_token ratio using EMA from message history.
 
@@ -159,30 +287,38 @@ def compute_chars_per_token_ema(messages: list[dict]) -> float:
 
     Args:
         messages: List of message dicts with content and optionally usage
+        view: Precomputed MessageView of messages, built if not given
 
     Returns:
         Computed chars_per_token ratio (default 4.0 if no data)
     """
+    if view is None:
+        view = _to_message_view(messages)
+
     chars_per_token = 4.0  # Starting estimate
     alpha = 0.2
+    decay = 1.0 - alpha
 
-    for msg in messages:
-        if msg.get("role") != "assistant":
-            continue
-
-        usage = msg.get("usage", {})
-        completion = usage.get("completion_tokens", 0) if usage else 0
-        content = msg.get("content", "")
+    # Extract the observed ratios up front so the EMA loop only does float math
+    ratios = [
+        content_len / completion
+        for role, completion, content_len in zip(
+            view.roles, view.completion_tokens, view.content_lens
+        )
+        if role == ROLE_ASSISTANT and completion > 0 and content_len > 0
+    ]
 
-        if completion > 0 and len(content) > 0:
-            actual_ratio = len(content) / completion
-            deviation_ratio = actual_ratio / chars_per_token
+    for actual_ratio in ratios:
+        deviation_ratio = actual_ratio / chars_per_token
 
-            # Outlier rejection: only update if within 0.5x-2x
-            if 0.5 <= deviation_ratio <= 2.0:
-                chars_per_token = (1.0 - alpha) * chars_per_token + alpha * actual_ratio
-                # Clamp between 2.0 and 5.0
-                chars_per_token = max(2.0, min(5.0, chars_per_token))
+        # Outlier rejection: only update if within 0.5x-2x
+        if 0.5 <= deviation_ratio <= 2.0:
+            chars_per_token = decay * chars_per_token + alpha * actual_ratio
+            # Clamp between 2.0 and 5.0
+            if chars_per_token < 2.0:
+                chars_per_token = 2.0
+            elif chars_per_token > 5.0:
+                chars_per_token = 5.0
 
     return chars_per_token
 
@@ -194,7 +330,9 @@ def estimate_tokens(content: str, chars_per_token: float = 4.0) -> int:
     return int(len(content) / chars_per_token)
 
 
-def compute_message_tokens(messages: list[dict]) -> list[int]:
+def compute_message_tokens(
+    messages: list[dict], view: Optional[MessageView] = None
+) -> list[int]:
     """
     Compute token counts for all messages using delta calculation.
 
@@ -205,82 +343,78 @@ def compute_message_tokens(messages: list[dict]) -> list[int]:
 
     Args:
         messages: List of message dicts with 'role', 'content', and optionally 'usage'
+        view: Precomputed MessageView of messages, built if not given
 
     Returns:
         List of token counts, one per message
     """
+    if view is None:
+        view = _to_message_view(messages)
+
     n = len(messages)
     tokens = [0] * n
 
     # Compute EMA chars_per_token from message history for fallback estimates
-    chars_per_token = compute_chars_per_token_ema(messages)
+    chars_per_token = compute_chars_per_token_ema(messages, view)
 
-    # Build list of (index, prompt_tokens, completion_tokens) for assistant msgs with usage
-    assistant_usages = []
-    for i, msg in enumerate(messages):
-        usage = msg.get("usage", {})
-        if msg.get("role") == "assistant":
-            prompt = usage.get("prompt_tokens", 0) if usage else 0
-            completion = usage.get("completion_tokens", 0) if usage else 0
-            assistant_usages.append((i, prompt, completion))
-
-    # Set assistant token counts: completion_tokens if > 0, else estimate from content
-    for idx, prompt, completion in assistant_usages:
-        if completion > 0:
-            tokens[idx] = completion
-        else:
-            content = messages[idx].get("content", "")
-            tokens[idx] = estimate_tokens(content, chars_per_token)
+    roles = view.roles
+    prompts = view.prompt_tokens
+    completions = view.completion_tokens
+    content_lens = view.content_lens
 
-    # Calculate user message tokens from deltas
+    # Calculate user message tokens from deltas in a single pass. A user
+    # message's count depends on the *next* assistant's prompt_tokens, so user
+    # indices wait in pending_users until that assistant arrives. Nothing can
+    # move last_prompt_tokens in between, since only assistants update it.
     # last_prompt_tokens tracks: prompt_tokens + completion_tokens after each assistant turn
     last_prompt_tokens = 0
-    asst_idx = 0
+    pending_users = []
 
-    for i, msg in enumerate(messages):
-        role = msg.get("role")
+    for i in range(n):
+        role = roles[i]
 
-        if role == "user":
-            # Find next assistant after this user message
-            while asst_idx < len(assistant_usages) and assistant_usages[asst_idx][0] < i:
-                asst_idx += 1
+        if role == ROLE_USER:
+            pending_users.append(i)
 
-            if asst_idx < len(assistant_usages):
-                next_idx, next_prompt, next_completion = assistant_usages[asst_idx]
-                if next_prompt > 0 and last_prompt_tokens > 0:
+        elif role == ROLE_ASSISTANT:
+            prompt = prompts[i]
+            completion = completions[i]
+
+            for u in pending_users:
+                if prompt > 0 and last_prompt_tokens > 0:
                     # Delta calculation: user_tokens = prompt_tokens - last_prompt_tokens
-                    user_tokens = next_prompt - last_prompt_tokens
-                    tokens[i] = max(0, user_tokens)
-                elif next_prompt > 0:
+                    tokens[u] = max(0, prompt - last_prompt_tokens)
+                elif prompt > 0:
                     # First user message: includes system prompt
-                    tokens[i] = next_prompt
+                    tokens[u] = prompt
                 else:
                     # No prompt_tokens available, estimate from content
-                    content = msg.get("content", "")
-                    tokens[i] = estimate_tokens(content, chars_per_token)
+                    tokens[u] = int(content_lens[u] / chars_per_token)
+            pending_users.clear()
+
+            # Assistant tokens: completion_tokens if > 0, else estimate from content
+            if completion > 0:
+                tokens[i] = completion
             else:
-                # No following assistant, estimate from content
-                content = msg.get("content", "")
-                tokens[i] = estimate_tokens(content, chars_per_token)
+                tokens[i] = int(content_lens[i] / chars_per_token)
 
-        elif role == "assistant":
-            usage = msg.get("usage", {})
-            prompt = usage.get("prompt_tokens", 0) if usage else 0
-            completion = usage.get("completion_tokens", 0) if usage else 0
             if prompt > 0:
                 # Update baseline: last_prompt_tokens = prompt_tokens + completion_tokens
                 last_prompt_tokens = prompt + completion
 
-        elif role == "tool":
+        elif role == ROLE_TOOL:
             # Tool messages: estimate from content
-            content = msg.get("content", "")
-            tokens[i] = estimate_tokens(content, chars_per_token)
+            tokens[i] = int(content_lens[i] / chars_per_token)
+
+    # No following assistant, estimate from content
+    for u in pending_users:
+        tokens[u] = int(content_lens[u] / chars_per_token)
 
     return tokens
 
 
 def calculate_turns_to_evict(
-    messages: list[dict], tokens_needed: int
+    messages: list[dict], tokens_needed: int, view: Optional[MessageView] = None
 ) -> list[tuple[int, int]]:
     """
     Calculate message ranges to evict using two-pass strategy.
@@ -293,6 +427,7 @@ def calculate_turns_to_evict(
     Args:
         messages: List of message dicts
         tokens_needed: Number of tokens to free
+        view: Precomputed MessageView of messages, built if not given
 
     Returns:
         List of (start_idx, end_idx) ranges to remove (inclusive)
@@ -300,13 +435,18 @@ def calculate_turns_to_evict(
     ranges = []
     tokens_freed = 0
 
+    if view is None:
+        view = _to_message_view(messages)
+    roles = view.roles
+    n = len(messages)
+
     # Precompute token counts using delta calculation
-    token_counts = compute_message_tokens(messages)
+    token_counts = compute_message_tokens(messages, view)
 
     # Find last user message (current turn - protected)
     last_user_idx = -1
-    for i in range(len(messages) - 1, -1, -1):
-        if messages[i].get("role") == "user":
+    for i in range(n - 1, -1, -1):
+        if roles[i] == ROLE_USER:
             last_user_idx = i
             break
 
@@ -317,18 +457,18 @@ def calculate_turns_to_evict(
     # PASS 1: Evict complete turns (USER -> final ASSISTANT)
     log.debug("Pass 1: Looking for complete turns to evict")
     i = 0
-    while i < len(messages) and tokens_freed < tokens_needed:
+    while i < n and tokens_freed < tokens_needed:
         # Stop before current user message
         if i >= last_user_idx:
             break
 
         # Skip system messages
-        if messages[i].get("role") == "system":
+        if roles[i] == ROLE_SYSTEM:
             i += 1
             continue
 
         # Skip non-user messages at start
-        if messages[i].get("role") != "user":
+        if roles[i] != ROLE_USER:
             i += 1
             continue
 
@@ -340,11 +480,11 @@ def calculate_turns_to_evict(
         final_assistant_idx = -1
         while i < last_user_idx:
             turn_tokens += token_counts[i]
-            role = messages[i].get("role")
+            role = roles[i]
 
-            if role == "assistant":
+            if role == ROLE_ASSISTANT:
                 # Check if this is final assistant (next is user or end)
-                if i + 1 >= len(messages) or i + 1 >= last_user_idx or messages[i + 1].get("role") == "user":
+                if i + 1 >= n or i + 1 >= last_user_idx or roles[i + 1] == ROLE_USER:
                     final_assistant_idx = i
                     i += 1
                     break
@@ -365,23 +505,23 @@ def calculate_turns_to_evict(
     # PASS 2: Evict mini-turns (ASSISTANT + tool pairs) from current turn
     log.debug(f"Pass 2: Need ~{tokens_needed - tokens_freed} more tokens")
 
-    if last_user_idx >= 0 and last_user_idx + 1 < len(messages):
+    if last_user_idx >= 0 and last_user_idx + 1 < n:
+        # Last assistant of the current turn is protected; evictions never move it
+        last_assistant_idx = -1
+        for j in range(n - 1, last_user_idx, -1):
+            if roles[j] == ROLE_ASSISTANT:
+                last_assistant_idx = j
+                break
+
         i = last_user_idx + 1
-        while i < len(messages) - 1 and tokens_freed < tokens_needed:
+        while i < n - 1 and tokens_freed < tokens_needed:
             # Look for ASSISTANT + tool pairs
             if (
-                messages[i].get("role") == "assistant"
-                and i + 1 < len(messages)
-                and messages[i + 1].get("role") == "tool"
+                roles[i] == ROLE_ASSISTANT
+                and i + 1 < n
+                and roles[i + 1] == ROLE_TOOL
             ):
                 # Skip if this is the last assistant (protect context)
-                # Find last assistant index
-                last_assistant_idx = -1
-                for j in range(len(messages) - 1, last_user_idx, -1):
-                    if messages[j].get("role") == "assistant":
-                        last_assistant_idx = j
-                        break
-
                 if i == last_assistant_idx:
                     log.debug(f"Pass 2: Skipping protected last assistant at {i}")
                     i += 2
@@ -417,23 +557,21 @@ def evict_messages(messages: list[dict], tokens_needed: int) -> tuple[list[dict]
     if tokens_needed <= 0:
         return messages, []
 
-    ranges = calculate_turns_to_evict(messages, tokens_needed)
+    view = _to_message_view(messages)
+    ranges = calculate_turns_to_evict(messages, tokens_needed, view)
     if not ranges:
         log.warning("No messages available for eviction")
         return messages, []
 
-    # Collect evicted message IDs before removing
+    # Collect evicted message IDs and clear their slots in the keep mask
+    ids = view.ids
+    keep = bytearray(b"\x01") * len(messages)
     evicted_ids = []
     for start, end in ranges:
-        for i in range(start, end + 1):
-            msg_id = messages[i].get("id")
-            if msg_id:
-                evicted_ids.append(msg_id)
+        keep[start : end + 1] = bytes(end + 1 - start)
+        evicted_ids.extend(msg_id for msg_id in ids[start : end + 1] if msg_id)
 
-    # Remove ranges in reverse order to preserve indices
-    result = messages.copy()
-    for start, end in reversed(ranges):
-        result = result[:start] + result[end + 1 :]
+    result = list(compress(messages, keep))
 
     evicted_count = len(messages) - len(result)
     log.info(f"Evicted {evicted_count} messages to free context space")
@@ -453,19 +591,20 @@ def evict_messages_fallback(messages: list[dict], percentage: float = 0.25) -> t
     Returns:
         Tuple of (new message list with evicted messages removed, list of evicted message IDs)
     """
+    n = len(messages)
+
+    # Both boundaries sit near the ends of the list, so scan lazily from each
+    # end and stop at the first hit rather than classifying every message.
     # Find first non-system message
-    start_idx = 0
-    for i, msg in enumerate(messages):
-        if msg.get("role") != "system":
-            start_idx = i
-            break
+    start_idx = next(
+        (i for i, msg in enumerate(messages) if msg.get("role") != "system"), 0
+    )
 
     # Protect last user message and beyond
-    last_user_idx = len(messages) - 1
-    for i in range(len(messages) - 1, -1, -1):
-        if messages[i].get("role") == "user":
-            last_user_idx = i
-            break
+    last_user_idx = next(
+        (i for i in range(n - 1, -1, -1) if messages[i].get("role") == "user"),
+        n - 1,
+    )
 
     evictable_count = last_user_idx - start_idx
     if evictable_count <= 0:
@@ -475,11 +614,9 @@ def evict_messages_fallback(messages: list[dict], percentage: float = 0.25) -> t
     end_idx = start_idx + to_remove
 
     # Collect evicted message IDs
-    evicted_ids = []
-    for i in range(start_idx, end_idx):
-        msg_id = messages[i].get("id")
-        if msg_id:
-            evicted_ids.append(msg_id)
+    evicted_ids = [
+        msg_id for msg in messages[start_idx:end_idx] if (msg_id := msg.get("id"))
+    ]
 
     log.info(f"Fallback eviction: removing {to_remove} messages ({percentage*100:.0f}%)")
     return messages[:start_idx] + messages[end_idx:], evicted_ids
@@ -6,25 +6,76 @@ Supports:
 - HashiCorp Vault via Unix socket: unix:///path/to/socket#/v1/secret/data/key
 """
 
+import asyncio
+import http.client
 import json
 import logging
 import os
 import re
 import socket
+import threading
+import time
+from typing import Optional
 
 log = logging.getLogger(__name__)
 
+# Seconds a resolved secret is reused before fetching it again (0 disables).
+# Read here rather than in env.py, which imports this module.
+SECRET_CACHE_TTL = os.environ.get("SECRET_CACHE_TTL", "300")
+try:
+    SECRET_CACHE_TTL = int(SECRET_CACHE_TTL) if SECRET_CACHE_TTL != "" else 0
+except Exception:
+    SECRET_CACHE_TTL = 300
+
+_secret_cache: dict[str, tuple[float, str]] = {}
+_secret_cache_lock = threading.Lock()
+
+# Name of an MSAL persistent token cache for Azure credentials, so tokens
+# survive restarts (empty disables). Only the environment client
+# secret/certificate credentials and the shared token cache credential read
+# it; managed identity does not, and the Azure CLI credential shells out to
+# az, which keeps its own cache.
+AZURE_TOKEN_CACHE_NAME = os.environ.get("AZURE_TOKEN_CACHE_NAME", "")
+
+# One credential shared by all vaults so its token cache is reused, plus one
+# SecretClient per vault URL
+_azure_credential = None
+_azure_clients: dict = {}
+_azure_lock = threading.Lock()
+
 AZURE_KEYVAULT_PATTERN = re.compile(
     r'^https://[\w-]+\.vault\.azure\.net/secrets/([\w-]+)(?:/([\w-]+))?$'
 )
 HASHICORP_UNIX_PATTERN = re.compile(r'^unix://([^#]+)#(.+)$')
 
+# Socket receive buffer, large enough to drain a KV v2 response in one go
+VAULT_SOCKET_RCVBUF = 262144
+
 
 class SecretResolutionError(Exception):
     """Raised when a secret cannot be resolved from a vault."""
     pass
 
 
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that talks to a server listening on a Unix socket."""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, VAULT_SOCKET_RCVBUF)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
 def resolve_secret(value: str) -> str:
     """
     Resolve a secret from a vault if the value matches a known pattern.
@@ -33,26 +84,95 @@ def resolve_secret(value: str) -> str:
     if not value or not isinstance(value, str):
         return value
 
-    if '.vault.azure.net/secrets/' in value:
-        return _resolve_azure_keyvault(value)
+    # Dispatch on the scheme prefix; the first character rules out most plain
+    # values before any prefix or substring search. The matching pattern runs
+    # once, in the resolver.
+    first = value[0]
+    if (
+        first == 'h'
+        and value.startswith('https://')
+        and '.vault.azure.net/secrets/' in value
+    ):
+        pattern, resolver = AZURE_KEYVAULT_PATTERN, _resolve_azure_keyvault
+    elif first == 'u' and value.startswith('unix://'):
+        pattern, resolver = HASHICORP_UNIX_PATTERN, _resolve_hashicorp_unix
+    else:
+        return value
+
+    entry = _get_cached_secret(value)
+    if entry:
+        return entry[1]
+
+    secret = resolver(value, pattern.match(value))
+    _set_cached_secret(value, secret)
+    return secret
+
 
-    if value.startswith('unix://'):
-        return _resolve_hashicorp_unix(value)
+async def resolve_secrets_batch(values: list[str]) -> list[str]:
+    """
+    Resolve several values concurrently, returning them in the same order.
+    HashiCorp Vault references are fetched natively over aiohttp, sharing one
+    keep-alive session per socket for the batch; Azure lookups block, so they
+    run in worker threads. N fetches take about as long as the slowest one.
+    """
+    unique = list(dict.fromkeys(values))
+    sessions = {}
+    try:
+        resolved = await asyncio.gather(
+            *(_resolve_secret_async(value, sessions) for value in unique)
+        )
+    finally:
+        for session in sessions.values():
+            await session.close()
 
-    return value
+    lookup = dict(zip(unique, resolved))
+    return [lookup[value] for value in values]
 
 
-def _resolve_azure_keyvault(url: str) -> str:
+async def _resolve_secret_async(value: str, sessions: dict) -> str:
+    if not (isinstance(value, str) and value.startswith('unix://')):
+        return await asyncio.to_thread(resolve_secret, value)
+
+    entry = _get_cached_secret(value)
+    if entry:
+        return entry[1]
+
+    secret = await _resolve_hashicorp_unix_async(
+        value, HASHICORP_UNIX_PATTERN.match(value), sessions
+    )
+    _set_cached_secret(value, secret)
+    return secret
+
+
+def _get_cached_secret(value: str) -> Optional[tuple[float, str]]:
+    if SECRET_CACHE_TTL <= 0:
+        return None
+
+    with _secret_cache_lock:
+        entry = _secret_cache.get(value)
+    if entry and time.monotonic() - entry[0] < SECRET_CACHE_TTL:
+        return entry
+    return None
+
+
+def _set_cached_secret(value: str, secret: str):
+    if SECRET_CACHE_TTL > 0:
+        with _secret_cache_lock:
+            _secret_cache[value] = (time.monotonic(), secret)
+
+
+def _resolve_azure_keyvault(url: str, match: Optional[re.Match]) -> str:
     """Fetch secret from Azure Key Vault using Managed Identity."""
+    # Availability check only: the client and credential are built (and
+    # these modules imported again) in _get_azure_secret_client
     try:
-        from azure.identity import DefaultAzureCredential
-        from azure.keyvault.secrets import SecretClient
+        from azure.identity import DefaultAzureCredential  # noqa: F401
+        from azure.keyvault.secrets import SecretClient  # noqa: F401
     except ImportError as e:
         raise SecretResolutionError(
             "azure-keyvault-secrets not installed"
         ) from e
 
-    match = AZURE_KEYVAULT_PATTERN.match(url)
     if not match:
         raise SecretResolutionError(f"Invalid Azure Key Vault URL: {url}")
 
@@ -63,8 +183,7 @@ def _resolve_azure_keyvault(url: str) -> str:
     log.info(f"Resolving secret '{secret_name}' from {vault_url}")
 
     try:
-        credential = DefaultAzureCredential()
-        client = SecretClient(vault_url=vault_url, credential=credential)
+        client = _get_azure_secret_client(vault_url)
         secret = client.get_secret(secret_name, version=secret_version)
         log.info(f"Successfully resolved secret '{secret_name}'")
         return secret.value
@@ -72,9 +191,39 @@ def _resolve_azure_keyvault(url: str) -> str:
         raise SecretResolutionError(f"Failed to fetch from Azure Key Vault: {e}") from e
 
 
-def _resolve_hashicorp_unix(url: str) -> str:
+def _get_azure_secret_client(vault_url: str):
+    """Return the cached SecretClient for a vault, creating it on first use."""
+    from azure.keyvault.secrets import SecretClient
+
+    global _azure_credential
+
+    with _azure_lock:
+        client = _azure_clients.get(vault_url)
+        if client is None:
+            if _azure_credential is None:
+                _azure_credential = _create_azure_credential()
+            client = SecretClient(vault_url=vault_url, credential=_azure_credential)
+            _azure_clients[vault_url] = client
+        return client
+
+
+def _create_azure_credential():
+    from azure.identity import DefaultAzureCredential
+
+    if not AZURE_TOKEN_CACHE_NAME:
+        return DefaultAzureCredential()
+
+    from azure.identity import TokenCachePersistenceOptions
+
+    return DefaultAzureCredential(
+        cache_persistence_options=TokenCachePersistenceOptions(
+            name=AZURE_TOKEN_CACHE_NAME
+        )
+    )
+
+
+def _resolve_hashicorp_unix(url: str, match: Optional[re.Match]) -> str:
     """Fetch secret from HashiCorp Vault via Unix socket."""
-    match = HASHICORP_UNIX_PATTERN.match(url)
     if not match:
         raise SecretResolutionError(f"Invalid HashiCorp Vault URL: {url}")
 
@@ -87,52 +236,83 @@ def _resolve_hashicorp_unix(url: str) -> str:
     log.info(f"Resolving secret from Vault via {socket_path}")
 
     try:
-        request = f"GET {vault_path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+        conn = _UnixHTTPConnection(socket_path, timeout=30)
+        try:
+            conn.request("GET", vault_path)
+            response = conn.getresponse()
+            if response.status != 200:
+                raise SecretResolutionError(
+                    f"Vault error: HTTP {response.status} {response.reason}"
+                )
+            data = json.loads(response.read())
+        finally:
+            conn.close()
+
+        return _extract_vault_secret(data)
+
+    except SecretResolutionError:
+        raise
+    except Exception as e:
+        raise SecretResolutionError(f"Failed to fetch from HashiCorp Vault: {e}") from e
 
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        sock.settimeout(30)
-        sock.connect(socket_path)
-        sock.sendall(request.encode('utf-8'))
-
-        response = b""
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            response += chunk
-        sock.close()
-
-        response_str = response.decode('utf-8')
-        headers_end = response_str.find('\r\n\r\n')
-        if headers_end == -1:
-            raise SecretResolutionError("Invalid HTTP response from Vault")
-
-        status_line = response_str.split('\r\n')[0]
-        if '200' not in status_line:
-            raise SecretResolutionError(f"Vault error: {status_line}")
-
-        body = response_str[headers_end + 4:]
-        data = json.loads(body)
-
-        # KV v2 structure: data.data.value
-        if 'data' in data and 'data' in data['data']:
-            secret_data = data['data']['data']
-            if 'value' in secret_data:
-                return secret_data['value']
-            if secret_data:
-                return next(iter(secret_data.values()))
-
-        # KV v1 structure: data.value
-        if 'data' in data:
-            secret_data = data['data']
-            if 'value' in secret_data:
-                return secret_data['value']
-            if secret_data:
-                return next(iter(secret_data.values()))
-
-        raise SecretResolutionError("Could not extract secret value from response")
+
+async def _resolve_hashicorp_unix_async(
+    url: str, match: Optional[re.Match], sessions: dict
+) -> str:
+    """Fetch secret from HashiCorp Vault via Unix socket without blocking."""
+    import aiohttp
+
+    if not match:
+        raise SecretResolutionError(f"Invalid HashiCorp Vault URL: {url}")
+
+    socket_path = match.group(1)
+    vault_path = match.group(2)
+
+    if not os.path.exists(socket_path):
+        raise SecretResolutionError(f"Unix socket not found: {socket_path}")
+
+    log.info(f"Resolving secret from Vault via {socket_path}")
+
+    try:
+        session = sessions.get(socket_path)
+        if session is None:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.UnixConnector(path=socket_path),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            sessions[socket_path] = session
+
+        async with session.get(f"http://localhost{vault_path}") as response:
+            if response.status != 200:
+                raise SecretResolutionError(
+                    f"Vault error: HTTP {response.status} {response.reason}"
+                )
+            data = json.loads(await response.read())
+
+        return _extract_vault_secret(data)
 
     except SecretResolutionError:
         raise
     except Exception as e:
         raise SecretResolutionError(f"Failed to fetch from HashiCorp Vault: {e}") from e
+
+
+def _extract_vault_secret(data: dict) -> str:
+    """Pull the secret value out of a KV v1 or v2 read response."""
+    # KV v2 structure: data.data.value
+    if 'data' in data and 'data' in data['data']:
+        secret_data = data['data']['data']
+        if 'value' in secret_data:
+            return secret_data['value']
+        if secret_data:
+            return next(iter(secret_data.values()))
+
+    # KV v1 structure: data.value
+    if 'data' in data:
+        secret_data = data['data']
+        if 'value' in secret_data:
+            return secret_data['value']
+        if secret_data:
+            return next(iter(secret_data.values()))
+
+    raise SecretResolutionError("Could not extract secret value from response")
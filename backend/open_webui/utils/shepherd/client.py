@@ -3,15 +3,46 @@ Shepherd Tool API Client.
 HTTP client for Shepherd's /v1/tools and /v1/tools/execute endpoints.
 """
 import logging
-import uuid
+import os
+import time
 from typing import Optional, Dict, Any, List
 
 import aiohttp
+import orjson
 
-from open_webui.env import AIOHTTP_CLIENT_TIMEOUT
+from open_webui.env import (
+    AIOHTTP_CLIENT_TIMEOUT,
+    SHEPHERD_TOOL_SPECS_CACHE_TTL,
+    SHEPHERD_TOOL_SPECS_MAX_SIZE,
+)
 
 log = logging.getLogger(__name__)
 
+# Connection pool for a client's session: bounded concurrency to the Shepherd
+# host, cached DNS, and idle connections kept long enough to span a chat's
+# back-to-back tool calls. Nagle needs no tuning here: asyncio already sets
+# TCP_NODELAY on every TCP transport it creates.
+CONNECTOR_LIMIT = 100
+CONNECTOR_LIMIT_PER_HOST = 32
+CONNECTOR_TTL_DNS_CACHE = 300
+CONNECTOR_KEEPALIVE_TIMEOUT = 75
+
+# Placeholder origin for requests sent over a unix:// socket; only the Host
+# header sees it
+UNIX_SOCKET_BASE_URL = "http://shepherd"
+
+# Parameters schema for tools that declare none, shared by every such spec.
+# It is a plain dict because specs are JSON-serialized into LLM requests.
+EMPTY_PARAMETERS = {"type": "object", "properties": {}}
+
+# Read buffer and chunk size for streaming tool list responses
+TOOL_SPECS_READ_BUFSIZE = 64 * 1024
+
+# Normalized tool lists shared across clients, keyed by server URL and request
+# headers (so credentials never share an entry): key -> (fetched_at, tool_specs)
+TOOL_SPECS_CACHE: Dict[tuple, tuple[float, List[Dict[str, Any]]]] = {}
+TOOL_SPECS_CACHE_MAX_ENTRIES = 256
+
 
 class ShepherdClient:
     """
@@ -19,18 +50,25 @@ class ShepherdClient:
 
     Unlike MCPClient which uses persistent MCP connections, ShepherdClient
     uses stateless HTTP requests. This is simpler and sufficient since
-    Shepherd's tool API is RESTful.
+    Shepherd's tool API is RESTful. Requests share one aiohttp session per
+    client so consecutive calls reuse pooled keep-alive connections. A
+    unix:///path/to/shepherd.sock URL talks to a co-located Shepherd over its
+    Unix domain socket instead of TCP.
 
     API compatibility with MCPClient:
     - connect(url, headers) - store connection info
     - list_tool_specs() - returns list of tool specs
     - call_tool(name, args) - executes tool and returns result
-    - disconnect() - no-op for HTTP
+    - disconnect() - closes the HTTP session
     """
 
     def __init__(self):
         self.url: Optional[str] = None
         self.headers: Optional[Dict[str, str]] = None
+        self._base_url: Optional[str] = None
+        self._socket_path: Optional[str] = None
+        self._request_headers: Dict[str, str] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
 
     async def connect(self, url: str, headers: Optional[Dict[str, str]] = None):
         """
@@ -39,20 +77,79 @@ class ShepherdClient:
         No persistent connection needed for HTTP - we just store the URL
         and headers for use in subsequent requests.
 
-        :param url: Base URL of the Shepherd API server (e.g., http://localhost:8000)
+        :param url: Base URL of the Shepherd API server (e.g., http://localhost:8000
+            or unix:///run/shepherd.sock)
         :param headers: Optional headers (e.g., {"Authorization": "Bearer ..."})
+        :raises RuntimeError: If a unix:// socket path does not exist
         """
         self.url = url.rstrip('/')
-        self.headers = headers or {}
+        self.set_headers(headers)
+
+        if self.url.startswith("unix://"):
+            self._socket_path = self.url[len("unix://"):]
+            if not os.path.exists(self._socket_path):
+                raise RuntimeError(f"Shepherd socket not found: {self._socket_path}")
+            self._base_url = UNIX_SOCKET_BASE_URL
+        else:
+            self._socket_path = None
+            self._base_url = self.url
+
+        # A session opened for a previous URL may be bound to the other transport
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
         log.debug(f"ShepherdClient configured for {self.url}")
 
-    async def list_tool_specs(self) -> List[Dict[str, Any]]:
+    def set_headers(self, headers: Optional[Dict[str, str]] = None):
+        """
+        Replace the extra request headers and rebuild the merged header set
+        sent with every request.
+
+        :param headers: Optional headers (e.g., {"Authorization": "Bearer ..."})
+        """
+        self.headers = headers or {}
+        self._request_headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            **self.headers,
+        }
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, opening it on first use."""
+        if self._session is None or self._session.closed:
+            if self._socket_path:
+                connector = aiohttp.UnixConnector(
+                    path=self._socket_path,
+                    limit=CONNECTOR_LIMIT_PER_HOST,
+                    keepalive_timeout=CONNECTOR_KEEPALIVE_TIMEOUT,
+                )
+            else:
+                connector = aiohttp.TCPConnector(
+                    limit=CONNECTOR_LIMIT,
+                    limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+                    ttl_dns_cache=CONNECTOR_TTL_DNS_CACHE,
+                    keepalive_timeout=CONNECTOR_KEEPALIVE_TIMEOUT,
+                )
+
+            # Proxy settings from the environment must not capture socket traffic
+            self._session = aiohttp.ClientSession(
+                trust_env=self._socket_path is None,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+                connector=connector,
+            )
+        return self._session
+
+    async def list_tool_specs(self, use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Fetch available tools from Shepherd API.
 
         Calls GET /v1/tools and returns the tools list normalized to match
-        the format expected by Open WebUI's middleware.
+        the format expected by Open WebUI's middleware. Results are reused
+        for SHEPHERD_TOOL_SPECS_CACHE_TTL seconds per server and header set,
+        so the returned spec dicts are shared and must be treated as
+        read-only.
 
+        :param use_cache: Return a fresh cached list if one exists
         :return: List of tool specs with name, description, parameters
         :raises RuntimeError: If client is not connected
         :raises Exception: On HTTP errors or invalid responses
@@ -60,39 +157,61 @@ class ShepherdClient:
         if not self.url:
             raise RuntimeError("ShepherdClient is not connected. Call connect() first.")
 
-        request_headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            **self.headers,
-        }
-
-        async with aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        ) as session:
-            async with session.get(
-                f"{self.url}/v1/tools",
-                headers=request_headers,
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    log.error(f"Failed to fetch tools from Shepherd: {response.status} - {error_text}")
-                    raise Exception(f"Failed to fetch tools: HTTP {response.status}")
-
-                data = await response.json()
-                tools = data.get("tools", [])
-
-                # Normalize to match MCPClient output format
-                tool_specs = []
-                for tool in tools:
-                    tool_specs.append({
-                        "name": tool.get("name"),
-                        "description": tool.get("description", ""),
-                        "parameters": tool.get("parameters", {"type": "object", "properties": {}}),
-                    })
-
-                log.debug(f"Fetched {len(tool_specs)} tools from Shepherd")
-                return tool_specs
+        cache_key = (self.url, tuple(sorted(self._request_headers.items())))
+        if use_cache and SHEPHERD_TOOL_SPECS_CACHE_TTL > 0:
+            entry = TOOL_SPECS_CACHE.get(cache_key)
+            if entry and time.monotonic() - entry[0] < SHEPHERD_TOOL_SPECS_CACHE_TTL:
+                return list(entry[1])
+
+        async with self._get_session().get(
+            f"{self._base_url}/v1/tools",
+            headers=self._request_headers,
+            read_bufsize=TOOL_SPECS_READ_BUFSIZE,
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                log.error(f"Failed to fetch tools from Shepherd: {response.status} - {error_text}")
+                raise Exception(f"Failed to fetch tools: HTTP {response.status}")
+
+            max_size = SHEPHERD_TOOL_SPECS_MAX_SIZE
+            if max_size and (response.content_length or 0) > max_size:
+                raise Exception(
+                    f"Tool list too large: {response.content_length} bytes (limit {max_size})"
+                )
+
+            # Stream the body so a missing or wrong Content-Length can't bypass the cap
+            body = bytearray()
+            async for chunk in response.content.iter_chunked(TOOL_SPECS_READ_BUFSIZE):
+                body.extend(chunk)
+                if max_size and len(body) > max_size:
+                    raise Exception(f"Tool list too large: over {max_size} bytes")
+
+            data = orjson.loads(body)
+            tools = data.get("tools", [])
+
+            # Normalize to match MCPClient output format
+            tool_specs = [
+                {
+                    "name": tool.get("name"),
+                    "description": tool.get("description", ""),
+                    "parameters": tool.get("parameters", EMPTY_PARAMETERS),
+                }
+                for tool in tools
+            ]
+
+            log.debug(f"Fetched {len(tool_specs)} tools from Shepherd")
+
+        if SHEPHERD_TOOL_SPECS_CACHE_TTL > 0:
+            now = time.monotonic()
+            if len(TOOL_SPECS_CACHE) >= TOOL_SPECS_CACHE_MAX_ENTRIES:
+                for key, (fetched_at, _) in list(TOOL_SPECS_CACHE.items()):
+                    if now - fetched_at >= SHEPHERD_TOOL_SPECS_CACHE_TTL:
+                        del TOOL_SPECS_CACHE[key]
+                if len(TOOL_SPECS_CACHE) >= TOOL_SPECS_CACHE_MAX_ENTRIES:
+                    TOOL_SPECS_CACHE.pop(next(iter(TOOL_SPECS_CACHE)))
+            TOOL_SPECS_CACHE[cache_key] = (now, tool_specs)
+
+        return list(tool_specs)
 
     async def call_tool(
         self, function_name: str, function_args: Dict[str, Any]
@@ -111,14 +230,8 @@ class ShepherdClient:
         if not self.url:
             raise RuntimeError("ShepherdClient is not connected. Call connect() first.")
 
-        request_headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            **self.headers,
-        }
-
         # Generate unique tool_call_id
-        tool_call_id = f"shepherd_{function_name}_{uuid.uuid4().hex[:8]}"
+        tool_call_id = f"shepherd_{function_name}_{os.urandom(4).hex()}"
 
         payload = {
             "name": function_name,
@@ -128,43 +241,41 @@ class ShepherdClient:
 
         log.debug(f"Executing Shepherd tool: {function_name} with args: {function_args}")
 
-        async with aiohttp.ClientSession(
-            trust_env=True,
-            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
-        ) as session:
-            async with session.post(
-                f"{self.url}/v1/tools/execute",
-                headers=request_headers,
-                json=payload,
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    log.error(f"Tool execution failed: {response.status} - {error_text}")
-                    raise Exception(f"Tool execution failed: HTTP {response.status}")
-
-                result = await response.json()
-
-                if not result.get("success", True):
-                    error_msg = result.get("error", "Unknown error")
-                    log.error(f"Tool {function_name} failed: {error_msg}")
-                    raise Exception(error_msg)
-
-                content = result.get("content", "")
-                log.debug(f"Tool {function_name} completed successfully")
-
-                # Return in MCP-compatible format (list of content blocks)
-                # This format is expected by Open WebUI's middleware
-                return [{"type": "text", "text": content}]
+        async with self._get_session().post(
+            f"{self._base_url}/v1/tools/execute",
+            headers=self._request_headers,
+            data=orjson.dumps(payload),
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                log.error(f"Tool execution failed: {response.status} - {error_text}")
+                raise Exception(f"Tool execution failed: HTTP {response.status}")
+
+            result = orjson.loads(await response.read())
+
+            if not result.get("success", True):
+                error_msg = result.get("error", "Unknown error")
+                log.error(f"Tool {function_name} failed: {error_msg}")
+                raise Exception(error_msg)
+
+            content = result.get("content", "")
+            log.debug(f"Tool {function_name} completed successfully")
+
+            # Return in MCP-compatible format (list of content blocks)
+            # This format is expected by Open WebUI's middleware
+            return [{"type": "text", "text": content}]
 
     async def disconnect(self):
         """
         Disconnect from Shepherd.
 
-        No-op for HTTP client since there's no persistent connection.
-        Included for API compatibility with MCPClient.
+        Closes the HTTP session and its pooled connections. Safe to call
+        more than once.
         """
-        log.debug("ShepherdClient disconnect (no-op for HTTP)")
-        pass
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        log.debug("ShepherdClient disconnected")
 
     async def __aenter__(self):
         """Async context manager entry."""
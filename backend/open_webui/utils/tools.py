@@ -758,7 +758,45 @@ async def get_tool_servers(request: Request):
     return tool_servers
 
 
-async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
+async def _fetch_tool_server_data(
+    session: aiohttp.ClientSession, url: str, headers: dict
+) -> Dict[str, Any]:
+    timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
+    async with session.get(
+        url,
+        headers=headers,
+        ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+        timeout=timeout,
+    ) as response:
+        if response.status != 200:
+            error_body = await response.json()
+            raise Exception(error_body)
+
+        text_content = None
+
+        # Check if URL ends with .yaml or .yml to determine format
+        if url.lower().endswith((".yaml", ".yml")):
+            text_content = await response.text()
+            res = yaml.safe_load(text_content)
+        else:
+            text_content = await response.text()
+
+        try:
+            res = json.loads(text_content)
+        except json.JSONDecodeError:
+            try:
+                res = yaml.safe_load(text_content)
+            except Exception as e:
+                raise e
+
+    return res
+
+
+async def get_tool_server_data(
+    url: str,
+    headers: Optional[dict],
+    session: Optional[aiohttp.ClientSession] = None,
+) -> Dict[str, Any]:
     _headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
@@ -769,31 +807,11 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
 
     error = None
     try:
-        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url, headers=_headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
-            ) as response:
-                if response.status != 200:
-                    error_body = await response.json()
-                    raise Exception(error_body)
-
-                text_content = None
-
-                # Check if URL ends with .yaml or .yml to determine format
-                if url.lower().endswith((".yaml", ".yml")):
-                    text_content = await response.text()
-                    res = yaml.safe_load(text_content)
-                else:
-                    text_content = await response.text()
-
-                try:
-                    res = json.loads(text_content)
-                except json.JSONDecodeError:
-                    try:
-                        res = yaml.safe_load(text_content)
-                    except Exception as e:
-                        raise e
+        if session is not None:
+            res = await _fetch_tool_server_data(session, url, _headers)
+        else:
+            async with aiohttp.ClientSession(trust_env=True) as session:
+                res = await _fetch_tool_server_data(session, url, _headers)
 
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")